@@ -0,0 +1,55 @@
+"""Startup benchmark: import time and RSS of `main` in a fresh interpreter.
+
+Usage: python bench_startup.py [--runs 5]
+
+Each run imports `main` in a clean subprocess (as `uvicorn main:app` would)
+and reports wall-clock import time, peak RSS and which provider SDKs ended
+up in sys.modules. A worker that only serves quiz reads should show none.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+import main  # noqa: F401
+elapsed = time.perf_counter() - t0
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+providers = [m for m in ("google.generativeai", "openai", "boto3", "youtube_transcript_api") if m in sys.modules]
+print(json.dumps({"import_s": elapsed, "rss_kb": rss_kb, "providers": providers}))
+"""
+
+
+def _run_once(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    results = [_run_once(env) for _ in range(args.runs)]
+    import_ms = [r["import_s"] * 1000 for r in results]
+    rss_mb = [r["rss_kb"] / 1024 for r in results]
+    print(f"runs:           {args.runs}")
+    print(f"import main:    median {statistics.median(import_ms):.1f} ms (min {min(import_ms):.1f}, max {max(import_ms):.1f})")
+    print(f"peak RSS:       median {statistics.median(rss_mb):.1f} MB")
+    print(f"providers:      {', '.join(results[-1]['providers']) or 'none loaded'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""End-to-end check of the direct-to-S3 upload flow against a local S3 stand-in.
+
+Usage: python check_direct_upload.py [--size-mb 12]
+
+Runs initiate -> PUT parts to the presigned URLs -> complete -> poll
+/final_result, then verifies that the object landed under its content key
+and the staging object was removed. Uses AWS_S3_ENDPOINT_URL (e.g. a MinIO
+container) if set, otherwise starts an in-process moto server.
+Requires: pip install httpx "moto[server]" (moto only without an endpoint).
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+import urllib.request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=12)
+    args = parser.parse_args()
+
+    server = None
+    if not os.getenv("AWS_S3_ENDPOINT_URL"):
+        from moto.server import ThreadedMotoServer
+
+        server = ThreadedMotoServer(port=5055, verbose=False)
+        server.start()
+        os.environ["AWS_S3_ENDPOINT_URL"] = "http://127.0.0.1:5055"
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+    os.environ.setdefault("AWS_S3_BUCKET", "quizplanner-check")
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    os.environ["VIDEO_UPLOAD_PART_SIZE"] = "0"  # minimum part size, so several parts
+
+    try:
+        from fastapi.testclient import TestClient
+
+        import main as backend
+        import video_store
+
+        s3 = video_store.s3_client()
+        bucket = video_store.s3_bucket()
+        try:
+            s3.create_bucket(Bucket=bucket)
+        except Exception:
+            pass
+
+        client = TestClient(backend.app)
+        quiz = client.post("/generate_quiz", json={"email": "check@example.com", "topic": "Python", "num_questions": 3})
+        quiz_id = quiz.json()["quiz_id"]
+        data = os.urandom(args.size_mb * 1024 * 1024)
+
+        init = client.post("/video_upload/initiate", json={"quiz_id": quiz_id, "filename": "check.mp4", "size": len(data)})
+        assert init.status_code == 200, init.text
+        upload = init.json()
+        parts = []
+        for p in upload["parts"]:
+            start = (p["part_number"] - 1) * upload["part_size"]
+            req = urllib.request.Request(
+                p["url"],
+                data=data[start : start + upload["part_size"]],
+                method="PUT",
+                headers={"Content-Type": "application/octet-stream"},
+            )
+            with urllib.request.urlopen(req) as resp:
+                parts.append({"part_number": p["part_number"], "etag": resp.headers["ETag"]})
+
+        done = client.post(
+            "/video_upload/complete",
+            json={"quiz_id": quiz_id, "key": upload["key"], "upload_id": upload["upload_id"], "filename": "check.mp4", "parts": parts},
+        )
+        assert done.status_code == 202, done.text
+
+        deadline = time.time() + 60
+        result = client.get(f"/final_result/{quiz_id}").json()
+        while result["video_status"] == "processing" and time.time() < deadline:
+            time.sleep(0.5)
+            result = client.get(f"/final_result/{quiz_id}").json()
+        assert result["video_status"] == "complete", result
+
+        expected = video_store.content_key(hashlib.sha256(data).hexdigest(), "check.mp4")
+        keys = [o["Key"] for o in s3.list_objects_v2(Bucket=bucket).get("Contents", [])]
+        assert expected in keys, keys
+        assert upload["key"] not in keys, keys
+        print(f"ok: {len(parts)} parts uploaded directly, stored as {expected}")
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
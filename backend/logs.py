@@ -0,0 +1,189 @@
+"""Non-blocking structured logging.
+
+Request handlers only enqueue log records; a QueueListener thread formats
+them as JSON lines and writes them to stdout, so a slow log drain never
+stalls the event loop. Every record carries the current request id, and
+sensitive fields (emails, signed quiz tokens, secrets) are redacted by the
+writer before anything leaves the process.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOGGER = logging.getLogger("ai_skill_bridge")
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_stages_var: ContextVar[Optional[dict]] = ContextVar("stages", default=None)
+
+SENSITIVE_KEYS = {"email", "to_email", "token", "t", "password", "secret", "api_key", "authorization", "x_admin_token"}
+_TOKEN_RE = re.compile(r"([?&](?:t|token|Signature|X-Amz-Signature|X-Amz-Credential)=)[^&\s\"']+")
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+REDACTED = "[REDACTED]"
+
+_listener: Optional[QueueListener] = None
+_dropped = 0
+_dropped_reported = 0
+_DROPPED_LOCK = threading.Lock()
+
+
+def redact(value):
+    if isinstance(value, str):
+        return _EMAIL_RE.sub(REDACTED, _TOKEN_RE.sub(r"\1" + REDACTED, value))
+    if isinstance(value, dict):
+        return {k: (REDACTED if str(k).lower() in SENSITIVE_KEYS else redact(v)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "event": redact(record.getMessage()),
+            "request_id": getattr(record, "request_id", None),
+        }
+        out.update(redact(getattr(record, "fields", None) or {}))
+        if record.exc_info:
+            out["exc"] = redact(self.formatException(record.exc_info))
+        return json.dumps(out, default=str)
+
+
+class _EnqueueHandler(QueueHandler):
+    """Hands the raw record to the writer thread; formatting happens there."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with _DROPPED_LOCK:
+                _dropped += 1
+
+
+class _RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+def setup() -> None:
+    """Install the queue handler and start the writer thread (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+    q: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    writer = logging.StreamHandler(sys.stdout)
+    writer.setFormatter(JsonFormatter())
+    _listener = QueueListener(q, writer)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    handler = _EnqueueHandler(q)
+    handler.addFilter(_RequestIdFilter())
+    LOGGER.addHandler(handler)
+    LOGGER.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    LOGGER.propagate = False
+
+
+def event(name: str, level: int = logging.INFO, exc_info=None, **fields) -> None:
+    """Log a structured event, e.g. event("email.sent", quiz_id=quiz_id)."""
+    if LOGGER.isEnabledFor(level):
+        LOGGER.log(level, name, exc_info=exc_info, extra={"fields": fields})
+
+
+def dropped() -> int:
+    """Records dropped because the queue was full."""
+    return _dropped
+
+
+def _take_dropped() -> int:
+    """Records dropped since the last call, so each drop is reported once."""
+    global _dropped_reported
+    with _DROPPED_LOCK:
+        n = _dropped - _dropped_reported
+        _dropped_reported = _dropped
+    return n
+
+
+@contextmanager
+def stage(name: str):
+    """Time a processing stage; totals are reported on the request log line."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = _stages_var.get()
+        if stages is not None:
+            stages[name] = round(stages.get(name, 0.0) + (time.perf_counter() - t0) * 1000, 2)
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware: assigns a request id and logs one line per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        rid = None
+        for k, v in scope.get("headers") or []:
+            if k == b"x-request-id":
+                rid = v.decode("latin-1")[:64]
+                break
+        rid = rid if rid and re.fullmatch(r"[A-Za-z0-9._-]+", rid) else uuid.uuid4().hex
+        rid_token = request_id_var.set(rid)
+        stages: dict = {}
+        stages_token = _stages_var.set(stages)
+        status = {"code": 500}
+        sent = {"at": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", rid.encode("latin-1"))]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                sent["at"] = time.perf_counter()
+
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Starlette runs BackgroundTasks inside the app call, after the
+            # response is sent; report that time apart from the request's own
+            end = time.perf_counter()
+            fields = {
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "status": status["code"],
+                "duration_ms": round(((sent["at"] or end) - t0) * 1000, 2),
+                "stages": stages,
+            }
+            if sent["at"] is not None and end - sent["at"] >= 0.001:
+                fields["background_ms"] = round((end - sent["at"]) * 1000, 2)
+            lost = _take_dropped()
+            if lost:
+                fields["dropped_logs"] = lost
+            event("request", **fields)
+            _stages_var.reset(stages_token)
+            request_id_var.reset(rid_token)
@@ -1,37 +1,34 @@
 import os
 import json
+import logging
 import hmac
 import base64
 import hashlib
 import random
+import re
+import asyncio
 import smtplib
+import time
 from email.message import EmailMessage
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks, Request, Query
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks, Request, Query, Header
 from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 from urllib.parse import urlparse, parse_qs
-try:
-    from youtube_transcript_api import YouTubeTranscriptApi  # type: ignore
-except Exception:  # pragma: no cover
-    YouTubeTranscriptApi = None
-
-try:
-    import google.generativeai as genai  # type: ignore
-except Exception:  # pragma: no cover
-    genai = None
-try:
-    from openai import OpenAI  # type: ignore
-except Exception:  # pragma: no cover
-    OpenAI = None
-try:
-    import boto3  # type: ignore
-except Exception:  # pragma: no cover
-    boto3 = None
+import logs
+import prescreen
+import profiling
+import providers
+import ranking
+import scoring
+import video_store
 
 # Simple in-file storage for MVP; replace with DB via SQLAlchemy
 QUIZZES: dict[str, dict] = {}
@@ -79,6 +76,8 @@ class FinalResultResponse(BaseModel):
     selected: Optional[bool]
     feedback: Optional[str]
     video_score: Optional[int] = None
+    # "processing" while a direct upload is being processed in the background
+    video_status: Optional[str] = None
 
 
 class SubmitVideoURLRequest(BaseModel):
@@ -87,13 +86,24 @@ class SubmitVideoURLRequest(BaseModel):
 
 
 load_dotenv()
+logs.setup()
 
-app = FastAPI(title="AI Skill Bridge Backend", version="0.2.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Optional: pay provider SDK imports at startup, off the event loop
+    if os.getenv("PROVIDER_WARMUP", "").lower() in {"1", "true", "yes"}:
+        await asyncio.to_thread(providers.warm_up)
+    yield
+
+
+app = FastAPI(title="AI Skill Bridge Backend", version="0.2.0", lifespan=lifespan)
 
 frontend_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
 frontend_base_url = os.getenv("FRONTEND_BASE_URL", "http://localhost:3000")
 secret_key = os.getenv("SECRET_KEY", "dev-secret-change-me")
 token_ttl_seconds = int(os.getenv("QUIZ_TOKEN_TTL_SECONDS", "259200"))  # default 3 days
+admin_token = os.getenv("ADMIN_TOKEN", "")
 
 # For local development, allow all origins to avoid CORS/preflight issues
 app.add_middleware(
@@ -104,6 +114,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in: when disabled the profiler is not on the request path at all
+if profiling.enabled_at_startup():
+    app.add_middleware(profiling.ProfilingMiddleware)
+app.add_middleware(logs.RequestContextMiddleware)
+
+
+def _require_admin(x_admin_token: Optional[str]) -> None:
+    if not admin_token or not x_admin_token or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
 
 @app.options("/{path:path}")
 async def cors_preflight(path: str, request: Request):
@@ -272,7 +292,7 @@ def _send_quiz_email_sync(to_email: str, quiz_id: str) -> None:
 
     # If SMTP is not configured, skip silently
     if not host or not user or not password:
-        print("[email] SMTP not configured; skipping send")
+        logs.event("email.skipped", quiz_id=quiz_id, reason="not_configured")
         if quiz_id in QUIZZES:
             QUIZZES[quiz_id]["email_status"] = {"queued": False, "sent": False, "error": "not_configured"}
         return
@@ -307,12 +327,12 @@ def _send_quiz_email_sync(to_email: str, quiz_id: str) -> None:
             with smtplib.SMTP_SSL(host, ssl_port, timeout=20) as server_ssl:
                 server_ssl.login(user, password)
                 server_ssl.send_message(msg)
-        print(f"[email] sent quiz link to {to_email} for {quiz_id}")
+        logs.event("email.sent", quiz_id=quiz_id, email=to_email)
         if quiz_id in QUIZZES:
             QUIZZES[quiz_id]["email_status"] = {"queued": True, "sent": True, "error": None}
     except Exception as e:
         # Avoid crashing the request path if email fails
-        print(f"[email] failed to send: {e}")
+        logs.event("email.failed", logging.WARNING, quiz_id=quiz_id, error=str(e))
         if quiz_id in QUIZZES:
             QUIZZES[quiz_id]["email_status"] = {"queued": True, "sent": False, "error": str(e)}
 
@@ -325,7 +345,7 @@ def _send_quiz_email_status(to_email: str, quiz_id: str) -> dict:
     sender = os.getenv("SMTP_FROM", user or "no-reply@example.com")
 
     if not host or not user or not password:
-        print("[email] SMTP not configured; skipping send")
+        logs.event("email.skipped", quiz_id=quiz_id, reason="not_configured")
         return {"queued": False, "sent": False, "error": "not_configured"}
 
     quiz_url = _build_quiz_url(quiz_id, QUIZZES.get(quiz_id, {}).get("topic"), QUIZZES.get(quiz_id, {}).get("num_questions"), QUIZZES.get(quiz_id, {}).get("email"))
@@ -351,74 +371,151 @@ def _send_quiz_email_status(to_email: str, quiz_id: str) -> dict:
             with smtplib.SMTP_SSL(host, ssl_port, timeout=20) as server_ssl:
                 server_ssl.login(user, password)
                 server_ssl.send_message(msg)
-        print(f"[email] sent quiz link to {to_email} for {quiz_id}")
+        logs.event("email.sent", quiz_id=quiz_id, email=to_email)
         return {"queued": True, "sent": True, "error": None}
     except Exception as e:
-        print(f"[email] failed to send: {e}")
+        logs.event("email.failed", logging.WARNING, quiz_id=quiz_id, error=str(e))
         return {"queued": True, "sent": False, "error": str(e)}
 
 
-def _generate_questions_with_gemini(topic: str, num: int) -> list[dict]:
-    api_key = os.getenv("GEMINI_API_KEY")
-    model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
-    if not api_key or genai is None:
-        return _fallback_generate_questions(topic, num)
+# Large quizzes are split into shards generated concurrently; questions a
+# shard fails to produce are retried and, failing that, topped up from templates.
+QUIZ_SHARD_SIZE = int(os.getenv("QUIZ_SHARD_SIZE", "5"))
+QUIZ_SHARD_RETRIES = int(os.getenv("QUIZ_SHARD_RETRIES", "2"))
+QUIZ_SHARD_CONCURRENCY = int(os.getenv("QUIZ_SHARD_CONCURRENCY", "6"))
+QUIZ_SHARD_BACKOFF_SECONDS = float(os.getenv("QUIZ_SHARD_BACKOFF_SECONDS", "0.5"))
+_SHARD_FOCUS = [
+    "core concepts and definitions",
+    "practical use cases",
+    "best practices",
+    "common pitfalls and misconceptions",
+    "tools and ecosystem",
+    "evaluation, performance and trade-offs",
+]
+
+
+def _normalize_question(q: object) -> Optional[dict]:
+    """Validate one generated question; None if it is unusable."""
+    if not isinstance(q, dict):
+        return None
+    text = str(q.get("text") or "").strip()
+    options = q.get("options")
+    if not text or not isinstance(options, list) or len(options) != 4:
+        return None
+    options = [str(o).strip() for o in options]
+    if not all(options) or len({o.lower() for o in options}) != 4:
+        return None
+    try:
+        correct_index = int(q.get("correct_index"))
+    except (TypeError, ValueError):
+        return None
+    if not 0 <= correct_index < 4:
+        return None
+    return {"id": "", "text": text, "options": options, "correct_index": correct_index}
 
-    genai.configure(api_key=api_key)
-    prompt = (
-        "Return ONLY valid JSON (no markdown). Schema: {\n"
-        "  \"questions\": [ { \"id\": string, \"text\": string, \"options\": [string,string,string,string], \"correct_index\": number } ]\n"
-        "}. Topic: "
-        f"{topic}. questions length: {num}. Keep options concise and distinct."
-    )
+
+def _parse_questions(text: str) -> list[dict]:
+    """Extract valid questions from a model response (object or bare array)."""
+    arr = None
     try:
-        model = genai.GenerativeModel(model_name)
-        resp = model.generate_content(prompt)
-        text = resp.text or ""
-        # Try object with 'questions'
-        try:
-            obj = json.loads(text)
-            arr = obj.get("questions") if isinstance(obj, dict) else None
-            if isinstance(arr, list) and arr:
-                out: list[dict] = []
-                for i, q in enumerate(arr):
-                    out.append(
-                        {
-                            "id": str(q.get("id") or f"q{i+1}"),
-                            "text": str(q.get("text") or f"Question about {topic} {i+1}"),
-                            "options": list(q.get("options") or ["A", "B", "C", "D"]),
-                            "correct_index": int(q.get("correct_index", 0)),
-                        }
-                    )
-                return out
-        except Exception:
-            pass
+        obj = json.loads(text)
+        arr = obj.get("questions") if isinstance(obj, dict) else obj
+    except Exception:
         # Fallback: attempt to extract first JSON array in the text
         start = text.find("[")
         end = text.rfind("]")
         if start != -1 and end != -1 and end > start:
             try:
                 arr = json.loads(text[start : end + 1])
-                out: list[dict] = []
-                for i, q in enumerate(arr):
-                    out.append(
-                        {
-                            "id": str(q.get("id") or f"q{i+1}"),
-                            "text": str(q.get("text") or f"Question about {topic} {i+1}"),
-                            "options": list(q.get("options") or ["A", "B", "C", "D"]),
-                            "correct_index": int(q.get("correct_index", 0)),
-                        }
-                    )
-                return out
             except Exception:
-                pass
-    except Exception:
-        pass
-    return _fallback_generate_questions(topic, num)
+                arr = None
+    if not isinstance(arr, list):
+        return []
+    return [q for q in (_normalize_question(x) for x in arr) if q is not None]
+
+
+def _shard_prompt(topic: str, num: int, focus: str) -> str:
+    return (
+        "Return ONLY valid JSON (no markdown). Schema: {\n"
+        "  \"questions\": [ { \"id\": string, \"text\": string, \"options\": [string,string,string,string], \"correct_index\": number } ]\n"
+        "}. Topic: "
+        f"{topic}. questions length: {num}. Keep options concise and distinct.{focus}"
+    )
+
+
+def _generate_gemini_shard(genai, model_name: str, topic: str, num: int, index: int, total: int) -> list[dict]:
+    """Generate one shard; may return fewer than ``num`` questions.
+
+    Valid questions are kept across attempts and retries only ask for the
+    missing count, with a short backoff. Retries happen only for unusable
+    output; an API error (rate limit, timeout) ends the shard immediately
+    so failures are not amplified across concurrent shards.
+    """
+    focus = ""
+    if total > 1:
+        focus = f" This is part {index + 1} of {total}; focus on {_SHARD_FOCUS[index % len(_SHARD_FOCUS)]}."
+    out: list[dict] = []
+    seen: set[str] = set()
+    for attempt in range(1 + max(0, QUIZ_SHARD_RETRIES)):
+        if attempt:
+            time.sleep(QUIZ_SHARD_BACKOFF_SECONDS * (2 ** (attempt - 1)) * (1 + random.random()))
+        missing = num - len(out)
+        try:
+            model = genai.GenerativeModel(model_name)
+            resp = model.generate_content(_shard_prompt(topic, missing, focus))
+        except Exception:
+            break
+        for q in _parse_questions(getattr(resp, "text", "") or ""):
+            key = " ".join(q["text"].lower().split())
+            if key not in seen:
+                seen.add(key)
+                out.append(q)
+        if len(out) >= num:
+            break
+    return out[:num]
+
+
+def _generate_questions_with_gemini(topic: str, num: int) -> list[dict]:
+    api_key = os.getenv("GEMINI_API_KEY")
+    model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    genai = providers.genai()
+    if not api_key or genai is None:
+        return _fallback_generate_questions(topic, num)
+
+    genai.configure(api_key=api_key)
+    shard_size = max(1, QUIZ_SHARD_SIZE)
+    sizes = [min(shard_size, num - start) for start in range(0, num, shard_size)]
+    if len(sizes) == 1:
+        shards = [_generate_gemini_shard(genai, model_name, topic, num, 0, 1)]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(QUIZ_SHARD_CONCURRENCY, len(sizes)))) as pool:
+            shards = list(
+                pool.map(
+                    lambda i: _generate_gemini_shard(genai, model_name, topic, sizes[i], i, len(sizes)),
+                    range(len(sizes)),
+                )
+            )
+
+    # Merge, drop duplicate questions across shards, then top up from templates
+    questions: list[dict] = []
+    seen: set[str] = set()
+    for shard in shards:
+        for q in shard:
+            key = " ".join(q["text"].lower().split())
+            if key not in seen:
+                seen.add(key)
+                questions.append(q)
+    questions = questions[:num]
+    if len(questions) < num:
+        questions += _fallback_generate_questions(topic, num - len(questions))
+    for i, q in enumerate(questions):
+        q["id"] = f"q{i+1}"
+    return questions
 
 
 def _generate_questions_with_openai(topic: str, num: int) -> list[dict]:
     api_key = os.getenv("OPENAI_API_KEY")
+    OpenAI = providers.openai_client_cls()
     if not api_key or OpenAI is None:
         return _fallback_generate_questions(topic, num)
 
@@ -478,7 +575,9 @@ async def generate_quiz(payload: GenerateQuizRequest, background_tasks: Backgrou
     quiz_id = f"quiz_{int(datetime.utcnow().timestamp()*1000)}"
 
     # Enforce role: Gemini only for quiz generation; fallback to local templates if missing
-    questions = _generate_questions_with_gemini(payload.topic, payload.num_questions)
+    with logs.stage("generate_questions"):
+        # Shard fan-out and retry backoff block, so keep them off the event loop
+        questions = await run_in_threadpool(_generate_questions_with_gemini, payload.topic, payload.num_questions)
     if not questions:
         questions = _fallback_generate_questions(payload.topic, payload.num_questions)
 
@@ -502,9 +601,9 @@ async def generate_quiz(payload: GenerateQuizRequest, background_tasks: Backgrou
     smtp_configured = bool(os.getenv("SMTP_HOST") and os.getenv("SMTP_USER") and os.getenv("SMTP_PASS"))
     if smtp_configured:
         background_tasks.add_task(_send_quiz_email_sync, payload.email, quiz_id)
-        print(f"[email] queued quiz link to {payload.email}: {quiz_url}")
+        logs.event("email.queued", quiz_id=quiz_id, email=payload.email, quiz_url=quiz_url)
     else:
-        print(f"[email] SMTP not configured; quiz link for {payload.email}: {quiz_url}")
+        logs.event("email.not_configured", quiz_id=quiz_id, email=payload.email, quiz_url=quiz_url)
 
     return GenerateQuizResponse(
         quiz_id=quiz_id,
@@ -574,7 +673,8 @@ async def get_quiz(quiz_id: str, request: Request, t: Optional[str] = Query(defa
                 "num_questions": num,
                 "created_at": datetime.utcnow().isoformat(),
             }
-            QUESTIONS[quiz_id] = _generate_questions_with_gemini(topic, num) or _fallback_generate_questions(topic, num)
+            questions = await run_in_threadpool(_generate_questions_with_gemini, topic, num)
+            QUESTIONS[quiz_id] = questions or _fallback_generate_questions(topic, num)
         else:
             raise HTTPException(status_code=404, detail="Quiz not found")
     questions = QUESTIONS[quiz_id]
@@ -621,6 +721,9 @@ async def submit_quiz(payload: SubmitQuizRequest):
         "total": total,
         "passed": passed,
     }
+    ranking.record(
+        QUIZZES.get(payload.quiz_id, {}).get("topic"), "quiz", payload.quiz_id, round(100 * score / total, 2)
+    )
 
     return SubmitQuizResponse(
         quiz_id=payload.quiz_id, score=score, total=total, passed=passed, suggestions=suggestions
@@ -647,67 +750,35 @@ async def quiz_result(quiz_id: str):
     )
 
 
-@app.post("/submit_video")
-async def submit_video(
-    quiz_id: str = Form(...),
-    file: UploadFile = File(...),
-):
-    if quiz_id not in QUIZZES:
-        raise HTTPException(status_code=404, detail="Quiz not found")
-
-    raw = await file.read()
-
-    # Optional S3 upload
-    dest_path = None
-    bucket = os.getenv("AWS_S3_BUCKET")
-    region = os.getenv("AWS_REGION")
-    if bucket and boto3 is not None:
-        try:
-            key = f"uploads/{quiz_id}_{file.filename}"
-            s3 = boto3.client("s3", region_name=region)
-            s3.put_object(Bucket=bucket, Key=key, Body=raw, ContentType=file.content_type or "application/octet-stream")
-            dest_path = f"s3://{bucket}/{key}"
-        except Exception:
-            # Fallback to local save
-            pass
-
-    if dest_path is None:
-        uploads_dir = os.path.join(os.getcwd(), "uploads")
-        os.makedirs(uploads_dir, exist_ok=True)
-        local_path = os.path.join(uploads_dir, f"{quiz_id}_{file.filename}")
-        with open(local_path, "wb") as f:
-            f.write(raw)
-        dest_path = local_path
-
-    # Transcribe using OpenAI Whisper if available
-    transcript = ""
-    if os.getenv("OPENAI_API_KEY") and OpenAI is not None:
-        try:
-            client = OpenAI()
-            # Note: whisper-1 accepts various audio/video formats including mp4
-            from io import BytesIO
-
-            stream = BytesIO(raw)
-            stream.name = file.filename  # Some clients use name for MIME hints
-            tr = client.audio.transcriptions.create(model="whisper-1", file=stream)  # type: ignore
-            transcript = getattr(tr, "text", "") or ""
-        except Exception:
-            transcript = ""
+def _transcribe_file(path: str, filename: Optional[str]) -> str:
+    """Transcribe a stored video with OpenAI Whisper; empty string if unavailable."""
+    client = providers.openai_client()
+    if client is None:
+        return ""
+    try:
+        # Note: whisper-1 accepts various audio/video formats including mp4
+        with open(path, "rb") as stream:
+            tr = client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(filename or os.path.basename(path), stream),  # name gives MIME hints
+            )  # type: ignore
+        return getattr(tr, "text", "") or ""
+    except Exception:
+        return ""
 
-    if not transcript:
-        transcript = "Candidate presented a solid understanding of basics and project overview."
 
-    # OpenAI-only analysis: produce feedback + numeric score 0-100
+def _analyze_transcript(transcript: str) -> tuple[int, str]:
+    """OpenAI-only analysis: produce numeric score 0-100 + feedback."""
     feedback = "Strong fundamentals; consider deeper examples of real-world integrations."
     video_score: int = 60
     try:
-        if os.getenv("OPENAI_API_KEY") and OpenAI is not None:
-            client = OpenAI()
+        client = providers.openai_client()
+        if client is not None:
             analysis_prompt = (
                 "You are an admissions reviewer. Read the transcript and return STRICT JSON with this schema:\n"
                 "{\n  \"score\": number (0-100 integer),\n  \"feedback\": string (1-2 sentences)\n}\n\n"
-                "Evaluate clarity, technical depth, relevance to topic, and communication.\n"
-                "Transcript:\n" + transcript
+                f"{scoring.RUBRIC}\n"
+                "Transcript:\n" + transcript[: scoring.MAX_TRANSCRIPT_CHARS]
             )
             resp = client.chat.completions.create(
                 model=os.getenv("OPENAI_FEEDBACK_MODEL", "gpt-4o-mini"),
@@ -717,17 +788,10 @@ async def submit_video(
             content = resp.choices[0].message.content or ""
             try:
                 obj = json.loads(content)
-                s = int(obj.get("score", video_score))
-                if s < 0:
-                    s = 0
-                if s > 100:
-                    s = 100
-                video_score = s
+                video_score = scoring.clamp_score(obj.get("score", video_score))
                 feedback = str(obj.get("feedback") or feedback)
             except Exception:
                 # fallback: try to extract first integer in content
-                import re
-
                 m = re.search(r"(\d{1,3})", content)
                 if m:
                     video_score = max(0, min(100, int(m.group(1))))
@@ -735,18 +799,85 @@ async def submit_video(
                     feedback = content.strip()
     except Exception:
         pass
+    return video_score, feedback
+
+
+def _score_transcript(transcript: str, topic: str, duration_s: Optional[float] = None) -> tuple[int, str, str]:
+    """Pre-screen locally; only clear rejects (in "on" mode) skip the LLM.
+
+    Returns (video_score, feedback, scored_by) with scored_by "prescreen" or "llm".
+    """
+    if prescreen.MODE == "off":
+        video_score, feedback = _analyze_transcript(transcript)
+        return video_score, feedback, "llm"
+    with logs.stage("prescreen"):
+        result = prescreen.screen(transcript, topic, duration_s)
+    if not result["use_llm"]:
+        return result["score"], result["feedback"], "prescreen"
+    with logs.stage("analyze"):
+        video_score, feedback = _analyze_transcript(transcript)
+    if result["decision"] != "borderline":
+        prescreen.record_agreement(result["decision"], video_score)
+    return video_score, feedback, "llm"
+
+
+def _process_video(quiz_id: str, digest: str, tmp_path: str, filename: Optional[str], persist) -> dict:
+    """Store (via ``persist``), transcribe and score spooled video bytes.
+
+    ``persist()`` returns {"path", "local_path"} like video_store.store();
+    it is skipped when these bytes were already stored and transcribed.
+    """
+    entry = video_store.CONTENT_INDEX.setdefault(digest, {})
+    local_path = tmp_path
+    try:
+        if entry.get("path") and "transcript" in entry:
+            # Already stored and transcribed: skip the S3 put and Whisper
+            video_store.discard(tmp_path)
+        else:
+            with logs.stage("store"):
+                stored = persist()
+            entry["path"] = stored["path"]
+            local_path = stored["local_path"]
+            # Transcribe using OpenAI Whisper if available
+            with logs.stage("transcribe"):
+                transcript = _transcribe_file(local_path, filename)
+            if transcript:
+                entry["transcript"] = transcript
+    finally:
+        if local_path != entry.get("path"):
+            video_store.discard(local_path)
+
+    transcribed = "transcript" in entry
+    transcript = entry.get("transcript") or "Candidate presented a solid understanding of basics and project overview."
+    if "video_score" in entry and entry.get("rubric_version") == scoring.RUBRIC_VERSION:
+        video_score, feedback, scored_by = entry["video_score"], entry["feedback"], "llm"
+    elif not transcribed:
+        # Whisper unavailable or failed: nothing real to pre-screen, keep the plain scoring path
+        video_score, feedback = _analyze_transcript(transcript)
+        scored_by = "llm"
+    else:
+        topic = QUIZZES.get(quiz_id, {}).get("topic", "")
+        video_score, feedback, scored_by = _score_transcript(transcript, topic)
+        # Only cache LLM analysis; pre-screen results depend on the topic
+        if scored_by == "llm":
+            entry["video_score"], entry["feedback"] = video_score, feedback
+            entry["rubric_version"] = scoring.RUBRIC_VERSION
 
     # Selection: must have passed quiz and achieve score >= 70
     passed_quiz = SUBMISSIONS.get(quiz_id, {}).get("passed", False)
     selected = bool(passed_quiz and video_score >= 70)
 
     VIDEO_ANALYSIS[quiz_id] = {
-        "path": dest_path,
+        "path": entry["path"],
+        "content_sha256": digest,
         "transcript": transcript,
         "feedback": feedback,
         "selected": selected,
         "video_score": video_score,
+        "scored_by": scored_by,
+        "rubric_version": scoring.RUBRIC_VERSION,
     }
+    ranking.record(QUIZZES.get(quiz_id, {}).get("topic"), "video", quiz_id, video_score)
 
     return {
         "quiz_id": quiz_id,
@@ -757,11 +888,126 @@ async def submit_video(
     }
 
 
+@app.post("/submit_video")
+async def submit_video(
+    quiz_id: str = Form(...),
+    file: UploadFile = File(...),
+):
+    if quiz_id not in QUIZZES:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+
+    # Stream to disk while hashing; identical bytes map to the same stored object
+    with logs.stage("spool"):
+        digest, tmp_path = await video_store.spool_upload(file)
+    return _process_video(
+        quiz_id,
+        digest,
+        tmp_path,
+        file.filename,
+        lambda: video_store.store(digest, tmp_path, file.filename, file.content_type),
+    )
+
+
+class InitiateVideoUploadRequest(BaseModel):
+    quiz_id: str
+    filename: str
+    content_type: Optional[str] = None
+    size: int = Field(gt=0, le=5 * 1024**4)
+
+
+class UploadedPart(BaseModel):
+    part_number: int = Field(ge=1, le=video_store.MAX_PARTS)
+    etag: str
+
+
+class CompleteVideoUploadRequest(BaseModel):
+    quiz_id: str
+    key: str
+    upload_id: str
+    filename: Optional[str] = None
+    parts: List[UploadedPart]
+
+
+class AbortVideoUploadRequest(BaseModel):
+    quiz_id: str
+    key: str
+    upload_id: str
+
+
+def _check_staging_key(quiz_id: str, key: str) -> None:
+    if quiz_id not in QUIZZES:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    if not key.startswith(video_store.staging_prefix(quiz_id)):
+        raise HTTPException(status_code=400, detail="Upload key does not belong to this quiz")
+
+
+@app.post("/video_upload/initiate")
+async def initiate_video_upload(payload: InitiateVideoUploadRequest):
+    """Issue presigned multipart URLs so the browser uploads straight to S3.
+
+    Returns 503 when S3 is not configured; clients fall back to /submit_video.
+    """
+    if payload.quiz_id not in QUIZZES:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    if video_store.s3_client() is None:
+        raise HTTPException(status_code=503, detail="Direct upload not available")
+    try:
+        return await run_in_threadpool(
+            video_store.initiate_multipart, payload.quiz_id, payload.filename, payload.content_type, payload.size
+        )
+    except Exception:
+        raise HTTPException(status_code=502, detail="Could not start upload")
+
+
+def _process_staged_upload(quiz_id: str, key: str, filename: Optional[str]) -> None:
+    """Background: download and hash a completed direct upload, then process it."""
+    try:
+        digest, tmp_path = video_store.spool_object(key)
+        _process_video(quiz_id, digest, tmp_path, filename or key, lambda: video_store.promote(key, digest, tmp_path))
+    except Exception as e:
+        logs.event("video_upload.process_failed", logging.WARNING, quiz_id=quiz_id, error=str(e))
+        VIDEO_ANALYSIS[quiz_id] = {"status": "error", "feedback": "Video processing failed; please resubmit."}
+    finally:
+        video_store.delete_object(key)
+
+
+@app.post("/video_upload/complete", status_code=202)
+async def complete_video_upload(payload: CompleteVideoUploadRequest, background_tasks: BackgroundTasks):
+    """Finish a direct upload and queue processing; poll /final_result for the outcome."""
+    _check_staging_key(payload.quiz_id, payload.key)
+    if video_store.s3_client() is None:
+        raise HTTPException(status_code=503, detail="Direct upload not available")
+    try:
+        await run_in_threadpool(
+            video_store.complete_multipart, payload.key, payload.upload_id, [p.model_dump() for p in payload.parts]
+        )
+    except Exception:
+        raise HTTPException(status_code=502, detail="Could not complete upload")
+    VIDEO_ANALYSIS[payload.quiz_id] = {"status": "processing"}
+    # Sync background tasks run in the threadpool, keeping the download,
+    # hashing, Whisper and GPT calls off the event loop
+    background_tasks.add_task(_process_staged_upload, payload.quiz_id, payload.key, payload.filename)
+    return {"quiz_id": payload.quiz_id, "status": "processing"}
+
+
+@app.post("/video_upload/abort")
+async def abort_video_upload(payload: AbortVideoUploadRequest):
+    _check_staging_key(payload.quiz_id, payload.key)
+    if video_store.s3_client() is None:
+        raise HTTPException(status_code=503, detail="Direct upload not available")
+    try:
+        await run_in_threadpool(video_store.abort_multipart, payload.key, payload.upload_id)
+    except Exception:
+        pass
+    return {"ok": True}
+
+
 @app.post("/submit_video_url")
 async def submit_video_url(payload: SubmitVideoURLRequest):
     if payload.quiz_id not in QUIZZES:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
+    YouTubeTranscriptApi = providers.youtube_transcript_api()
     if YouTubeTranscriptApi is None:
         raise HTTPException(status_code=500, detail="YouTube transcript dependency not available")
 
@@ -770,58 +1016,29 @@ async def submit_video_url(payload: SubmitVideoURLRequest):
         raise HTTPException(status_code=400, detail="Invalid YouTube URL")
 
     # Try transcript in preferred languages
-    transcript_text = ""
-    try:
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=["en", "en-US", "en-GB"])
-        transcript_text = " ".join([seg.get("text", "") for seg in transcript_list])
-    except Exception:
-        # Try generated
+    with logs.stage("transcribe"):
+        segments: list = []
         try:
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            tr = transcript_list.find_transcript(["en"]).fetch()
-            transcript_text = " ".join([seg.get("text", "") for seg in tr])
+            segments = YouTubeTranscriptApi.get_transcript(video_id, languages=["en", "en-US", "en-GB"])
         except Exception:
-            transcript_text = ""
-
-    if not transcript_text:
-        transcript_text = "Transcript unavailable; evaluate based on overall content quality heuristics."
-
-    # OpenAI-only feedback + score
-    feedback = "Strong fundamentals; consider deeper examples of real-world integrations."
-    video_score: int = 60
-    try:
-        if os.getenv("OPENAI_API_KEY") and OpenAI is not None:
-            client = OpenAI()
-            analysis_prompt = (
-                "You are an admissions reviewer. Read the transcript and return STRICT JSON with this schema:\n"
-                "{\n  \"score\": number (0-100 integer),\n  \"feedback\": string (1-2 sentences)\n}\n\n"
-                "Evaluate clarity, technical depth, relevance to topic, and communication.\n"
-                "Transcript:\n" + transcript_text
-            )
-            resp = client.chat.completions.create(
-                model=os.getenv("OPENAI_FEEDBACK_MODEL", "gpt-4o-mini"),
-                messages=[{"role": "user", "content": analysis_prompt}],
-                temperature=0.2,
-            )
-            content = resp.choices[0].message.content or ""
+            # Try generated
             try:
-                obj = json.loads(content)
-                s = int(obj.get("score", video_score))
-                if s < 0:
-                    s = 0
-                if s > 100:
-                    s = 100
-                video_score = s
-                feedback = str(obj.get("feedback") or feedback)
+                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+                segments = transcript_list.find_transcript(["en"]).fetch()
             except Exception:
-                import re
-                m = re.search(r"(\d{1,3})", content)
-                if m:
-                    video_score = max(0, min(100, int(m.group(1))))
-                if content.strip():
-                    feedback = content.strip()
-    except Exception:
-        pass
+                segments = []
+        transcript_text = " ".join([seg.get("text", "") for seg in segments])
+        duration_s = max((float(seg.get("start", 0)) + float(seg.get("duration", 0)) for seg in segments), default=None)
+
+    # OpenAI-only feedback + score
+    topic = QUIZZES.get(payload.quiz_id, {}).get("topic", "")
+    if transcript_text:
+        video_score, feedback, scored_by = _score_transcript(transcript_text, topic, duration_s)
+    else:
+        # No captions: nothing real to pre-screen, keep the plain scoring path
+        transcript_text = "Transcript unavailable; evaluate based on overall content quality heuristics."
+        video_score, feedback = _analyze_transcript(transcript_text)
+        scored_by = "llm"
 
     passed_quiz = SUBMISSIONS.get(payload.quiz_id, {}).get("passed", False)
     selected = bool(passed_quiz and video_score >= 70)
@@ -832,7 +1049,10 @@ async def submit_video_url(payload: SubmitVideoURLRequest):
         "feedback": feedback,
         "selected": selected,
         "video_score": video_score,
+        "scored_by": scored_by,
+        "rubric_version": scoring.RUBRIC_VERSION,
     }
+    ranking.record(topic, "video", payload.quiz_id, video_score)
 
     return {
         "quiz_id": payload.quiz_id,
@@ -853,6 +1073,178 @@ async def final_result(quiz_id: str):
         selected=analysis.get("selected") if analysis else None,
         feedback=analysis.get("feedback") if analysis else None,
         video_score=analysis.get("video_score") if analysis else None,
+        video_status=(analysis.get("status") or "complete") if analysis else None,
+    )
+
+
+class RescoreRequest(BaseModel):
+    job_name: str = Field(default="rescore", pattern=r"^[A-Za-z0-9_-]{1,64}$")
+    quiz_ids: Optional[List[str]] = None
+    rescore_all: bool = False
+    backend: Optional[str] = Field(default=None, pattern=r"^(openai|fake)$")
+    pack_size: int = Field(default=8, ge=1, le=50)
+    concurrency: int = Field(default=4, ge=1, le=32)
+
+
+def _apply_scores(results: dict[str, dict], scored_by: str) -> None:
+    """Write batch scores back to VIDEO_ANALYSIS (and the content cache) in one pass.
+
+    Entries whose transcript changed since it was scored (a resubmission
+    while the job ran) or that are still processing are left alone.
+    """
+    for quiz_id, scored in results.items():
+        analysis = VIDEO_ANALYSIS.get(quiz_id)
+        if analysis is None or analysis.get("status") == "processing":
+            continue
+        transcript = analysis.get("transcript")
+        if not transcript or scoring.transcript_digest(transcript) != scored["transcript_sha256"]:
+            logs.event("rescore.skipped", quiz_id=quiz_id, reason="transcript_changed")
+            continue
+        r = {k: v for k, v in scored.items() if k != "transcript_sha256"}
+        passed_quiz = SUBMISSIONS.get(quiz_id, {}).get("passed", False)
+        analysis.update(r)
+        analysis["scored_by"] = scored_by
+        analysis["selected"] = bool(passed_quiz and r["video_score"] >= 70)
+        ranking.record(QUIZZES.get(quiz_id, {}).get("topic"), "video", quiz_id, r["video_score"])
+        entry = video_store.CONTENT_INDEX.get(analysis.get("content_sha256") or "")
+        if entry is not None and entry.get("transcript") == analysis.get("transcript"):
+            entry.update(r)
+
+
+def _run_rescore(payload: RescoreRequest, backend) -> None:
+    wanted = set(payload.quiz_ids) if payload.quiz_ids else None
+    items = {
+        quiz_id: a["transcript"]
+        for quiz_id, a in list(VIDEO_ANALYSIS.items())
+        if (wanted is None or quiz_id in wanted) and scoring.needs_rescore(a, payload.rescore_all)
+    }
+    results = scoring.run_batch(payload.job_name, items, backend, payload.pack_size, payload.concurrency)
+    if backend.dry_run:
+        # Kept on the job for inspection; selection, ranking and the cache stay untouched
+        scoring.JOBS[payload.job_name]["results"] = results
+        return
+    _apply_scores(results, backend.name)
+
+
+@app.post("/admin/rescore")
+async def rescore(payload: RescoreRequest, background_tasks: BackgroundTasks, x_admin_token: Optional[str] = Header(default=None)):
+    """Start a batched rescoring job; rerun with the same job_name to resume."""
+    _require_admin(x_admin_token)
+    job = scoring.JOBS.get(payload.job_name)
+    if job and job["status"] == "running":
+        raise HTTPException(status_code=409, detail="Job already running")
+    try:
+        backend = scoring.default_backend(payload.backend)
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    scoring.JOBS[payload.job_name] = {"job": payload.job_name, "status": "running"}
+    background_tasks.add_task(_run_rescore, payload, backend)
+    return {
+        "ok": True,
+        "job": payload.job_name,
+        "backend": backend.name,
+        "dry_run": backend.dry_run,
+        "rubric_version": scoring.RUBRIC_VERSION,
+    }
+
+
+@app.get("/admin/rescore/{job_name}")
+async def rescore_status(job_name: str, x_admin_token: Optional[str] = Header(default=None)):
+    _require_admin(x_admin_token)
+    job = scoring.JOBS.get(job_name)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/admin/ranking/{quiz_id}")
+async def candidate_ranking(quiz_id: str, x_admin_token: Optional[str] = Header(default=None)):
+    """Rank and percentile of a candidate's quiz and video scores within their topic."""
+    _require_admin(x_admin_token)
+    if quiz_id not in QUIZZES:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    topic = QUIZZES[quiz_id].get("topic")
+    return {
+        "quiz_id": quiz_id,
+        "topic": ranking.normalize_topic(topic),
+        "quiz": ranking.rank(topic, "quiz", quiz_id),
+        "video": ranking.rank(topic, "video", quiz_id),
+    }
+
+
+@app.get("/admin/leaderboard")
+async def leaderboard(
+    topic: str,
+    metric: str = Query(default="video", pattern=r"^(quiz|video)$"),
+    k: int = Query(default=10, ge=1, le=500),
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    _require_admin(x_admin_token)
+    return ranking.leaderboard(topic, metric, k)
+
+
+class PrescreenConfigRequest(BaseModel):
+    mode: Optional[str] = Field(default=None, pattern=r"^(on|shadow|off)$")
+    min_words: Optional[int] = Field(default=None, ge=0)
+    reject_relevance: Optional[float] = Field(default=None, ge=0, le=1)
+    min_keywords: Optional[int] = Field(default=None, ge=0)
+    accept_relevance: Optional[float] = Field(default=None, ge=0, le=1)
+    accept_min_words: Optional[int] = Field(default=None, ge=0)
+    accept_max_filler: Optional[float] = Field(default=None, ge=0, le=1)
+    accept_min_wpm: Optional[float] = Field(default=None, ge=0)
+    accept_max_wpm: Optional[float] = Field(default=None, ge=0)
+    audit_rate: Optional[float] = Field(default=None, ge=0, le=1)
+
+
+@app.get("/admin/prescreen")
+async def prescreen_status(x_admin_token: Optional[str] = Header(default=None)):
+    _require_admin(x_admin_token)
+    return prescreen.status()
+
+
+@app.post("/admin/prescreen")
+async def prescreen_configure(payload: PrescreenConfigRequest, x_admin_token: Optional[str] = Header(default=None)):
+    """Tune pre-screen mode and thresholds at runtime."""
+    _require_admin(x_admin_token)
+    return prescreen.configure(**payload.model_dump())
+
+
+class ProfilingConfigRequest(BaseModel):
+    sample_rate: Optional[float] = Field(default=None, ge=0, le=1)
+    routes: Optional[List[str]] = None
+    interval_ms: Optional[float] = Field(default=None, ge=1)
+    max_profiles: Optional[int] = Field(default=None, ge=1, le=1000)
+
+
+def _require_profiling(x_admin_token: Optional[str]) -> None:
+    _require_admin(x_admin_token)
+    if not profiling.enabled_at_startup():
+        raise HTTPException(status_code=404, detail="Profiling disabled (set PROFILING_ENABLED=1)")
+
+
+@app.get("/admin/profiling")
+async def profiling_status(x_admin_token: Optional[str] = Header(default=None)):
+    _require_profiling(x_admin_token)
+    return {"config": dict(profiling.CONFIG), "profiles": profiling.list_profiles()}
+
+
+@app.post("/admin/profiling")
+async def profiling_configure(payload: ProfilingConfigRequest, x_admin_token: Optional[str] = Header(default=None)):
+    _require_profiling(x_admin_token)
+    return {"config": profiling.configure(**payload.model_dump())}
+
+
+@app.get("/admin/profiling/{profile_id}")
+async def profiling_download(profile_id: int, x_admin_token: Optional[str] = Header(default=None)):
+    """Download one profile as folded stacks (flamegraph.pl / speedscope)."""
+    _require_profiling(x_admin_token)
+    data = profiling.folded(profile_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(
+        content=data,
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'},
     )
 
 
@@ -0,0 +1,209 @@
+"""Local heuristic pre-screen for transcripts before LLM scoring.
+
+Cheap on-box features catch the obvious failures: empty or very short
+transcripts, and clearly off-topic ones when the topic has enough keywords
+for relevance to mean something, are rejected without an LLM call.
+Everything else goes to the OpenAI feedback model; "accept" is only a
+label used to measure agreement, so a passing score always comes from the
+LLM. Relevance is the IDF-weighted share of topic keywords (the topic's
+own words plus a small expansion table) found in the transcript; document
+frequencies are learned from the transcripts seen so far.
+
+PRESCREEN_MODE is "shadow" (default: decide but always call the LLM),
+"on" (rejects skip the LLM) or "off". Switch to "on" only once AGREEMENT
+shows the rejects match the LLM; in "on" mode a fraction of rejects
+(audit_rate) is still sent to the LLM to keep measuring it.
+"""
+import math
+import os
+import random
+import re
+import threading
+from collections import Counter
+from typing import Optional
+
+MODE = os.getenv("PRESCREEN_MODE", "shadow").lower()
+
+THRESHOLDS: dict = {
+    "min_words": 20,  # fewer words: reject as unusable
+    "reject_relevance": 0.05,  # below this (with enough words): reject as off-topic
+    "min_keywords": 5,  # topics with fewer keywords are never rejected as off-topic
+    "accept_relevance": 0.5,
+    "accept_min_words": 150,
+    "accept_max_filler": 0.03,
+    "accept_min_wpm": 90,
+    "accept_max_wpm": 200,
+    "audit_rate": float(os.getenv("PRESCREEN_AUDIT_RATE", "0.05")),
+}
+
+FILLERS = {"um", "umm", "uh", "uhh", "erm", "er", "ah", "hmm", "like", "basically", "actually", "literally"}
+FILLER_PHRASES = ("you know", "i mean", "kind of", "sort of")
+
+TOPIC_KEYWORDS: dict[str, list[str]] = {
+    "python": ["python", "function", "class", "list", "dict", "module", "package", "pandas", "numpy", "script", "library"],
+    "generative ai": [
+        "generative", "model", "prompt", "llm", "gpt", "diffusion", "embedding", "fine", "tuning", "token", "rag",
+        "retrieval", "vector", "generation", "inference", "hallucination",
+    ],
+    "llm": [
+        "llm", "language", "model", "prompt", "token", "transformer", "gpt", "context", "embedding", "fine", "tuning",
+        "rag", "retrieval", "vector", "inference", "hallucination",
+    ],
+    "machine learning": [
+        "model", "training", "data", "feature", "accuracy", "regression", "classification", "dataset", "overfitting",
+        "embedding", "vector", "prediction", "inference",
+    ],
+    "deep learning": ["neural", "network", "layer", "training", "gradient", "model", "pytorch", "tensorflow", "cnn", "transformer"],
+    "data science": ["data", "analysis", "pandas", "visualization", "statistics", "model", "dataset", "sql", "notebook"],
+    "nlp": ["language", "text", "token", "embedding", "transformer", "sentiment", "classification", "model"],
+    "computer vision": ["image", "vision", "cnn", "detection", "segmentation", "opencv", "pixel", "model"],
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on", "or", "that",
+    "the", "this", "to", "was", "were", "will", "with", "i", "we", "you", "my", "our", "so", "but", "ai",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_LOCK = threading.Lock()
+_DOC_FREQ: Counter = Counter()
+_N_DOCS = 0
+
+STATS: Counter = Counter()  # decisions: accept / reject / borderline
+# decision -> {"audited", "agree"}; agreement = LLM puts the case on the same side of 70
+AGREEMENT: dict[str, Counter] = {"accept": Counter(), "reject": Counter()}
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping so "models"/"model" and "embeddings"/"embedding" match."""
+    if len(word) > 4 and word.endswith("es") and word.endswith(("ses", "xes", "zes", "ches", "shes")):
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    if len(word) > 5 and word.endswith("ing"):
+        word = word[:-3]
+    return word
+
+
+def _terms(text: str) -> set[str]:
+    """Stemmed tokens; relevance, keywords and document frequencies all use these."""
+    return {_stem(w) for w in _tokens(text)}
+
+
+def topic_keywords(topic: str) -> set[str]:
+    t = (topic or "").lower()
+    words = {w for w in _tokens(t) if w not in STOPWORDS and len(w) > 1}
+    for key, extra in TOPIC_KEYWORDS.items():
+        if key in t or any(w == key for w in words):
+            words.update(extra)
+    return {_stem(w) for w in words}
+
+
+def _idf(term: str) -> float:
+    return math.log((1 + _N_DOCS) / (1 + _DOC_FREQ[term])) + 1.0
+
+
+def features(transcript: str, topic: str, duration_s: Optional[float] = None) -> dict:
+    text = (transcript or "").strip()
+    lowered = text.lower()
+    tokens = _tokens(lowered)
+    words = len(tokens)
+    present = _terms(lowered)
+
+    keywords = topic_keywords(topic)
+    total = sum(_idf(k) for k in keywords)
+    relevance = sum(_idf(k) for k in keywords if k in present) / total if total else 0.0
+
+    fillers = sum(1 for w in tokens if w in FILLERS) + sum(lowered.count(p) for p in FILLER_PHRASES)
+    return {
+        "words": words,
+        "keywords": len(keywords),
+        "relevance": round(relevance, 4),
+        "filler_ratio": round(fillers / words, 4) if words else 0.0,
+        "wpm": round(words / (duration_s / 60.0), 1) if duration_s else None,
+    }
+
+
+def decide(f: dict) -> tuple[str, Optional[int], Optional[str]]:
+    """Return (decision, score, feedback); score/feedback are only set for "reject"."""
+    th = THRESHOLDS
+    if f["words"] < th["min_words"]:
+        return "reject", 0, "Transcript was empty or too short to evaluate; please resubmit a clear recording."
+    if f["keywords"] >= th["min_keywords"] and f["relevance"] < th["reject_relevance"]:
+        return "reject", 20, "The video does not appear to address the quiz topic."
+    wpm_ok = f["wpm"] is None or th["accept_min_wpm"] <= f["wpm"] <= th["accept_max_wpm"]
+    if (
+        f["relevance"] >= th["accept_relevance"]
+        and f["words"] >= th["accept_min_words"]
+        and f["filler_ratio"] <= th["accept_max_filler"]
+        and wpm_ok
+    ):
+        return "accept", None, None
+    return "borderline", None, None
+
+
+def observe(transcript: str) -> None:
+    """Add a transcript to the document-frequency table used for IDF."""
+    global _N_DOCS
+    terms = _terms(transcript or "")
+    with _LOCK:
+        _N_DOCS += 1
+        _DOC_FREQ.update(terms)
+
+
+def screen(transcript: str, topic: str, duration_s: Optional[float] = None) -> dict:
+    """Pre-screen one transcript.
+
+    Returns {"decision", "score", "feedback", "features", "use_llm", "audit"}.
+    When use_llm is False (only ever for a reject) the caller should use
+    score/feedback as final.
+    """
+    f = features(transcript, topic, duration_s)
+    decision, score, feedback = decide(f)
+    observe(transcript)
+    with _LOCK:
+        STATS[decision] += 1
+    rejected = decision == "reject"
+    audit = rejected and MODE != "off" and (MODE == "shadow" or random.random() < THRESHOLDS["audit_rate"])
+    use_llm = MODE != "on" or not rejected or audit
+    return {"decision": decision, "score": score, "feedback": feedback, "features": f, "use_llm": use_llm, "audit": audit}
+
+
+def record_agreement(decision: str, llm_score: int) -> None:
+    if decision not in AGREEMENT:
+        return
+    agree = (llm_score >= 70) == (decision == "accept")
+    with _LOCK:
+        AGREEMENT[decision]["audited"] += 1
+        AGREEMENT[decision]["agree"] += int(agree)
+
+
+def configure(mode: Optional[str] = None, **thresholds) -> dict:
+    global MODE
+    if mode is not None:
+        MODE = mode
+    for k, v in thresholds.items():
+        if v is not None and k in THRESHOLDS:
+            THRESHOLDS[k] = v
+    return status()
+
+
+def status() -> dict:
+    return {
+        "mode": MODE,
+        "thresholds": dict(THRESHOLDS),
+        "decisions": dict(STATS),
+        "agreement": {
+            k: {
+                "audited": c["audited"],
+                "agree": c["agree"],
+                "rate": round(c["agree"] / c["audited"], 4) if c["audited"] else None,
+            }
+            for k, c in AGREEMENT.items()
+        },
+        "documents_seen": _N_DOCS,
+    }
@@ -0,0 +1,180 @@
+"""On-demand sampling profiler for live requests.
+
+Installed only when PROFILING_ENABLED=1 at startup; otherwise nothing is
+added to the request path. Once installed, profiling stays idle until an
+admin sets a sample rate or a list of routes. A profiled request gets a
+background thread that samples the serving thread's stack every few
+milliseconds; the last N profiles are kept in memory and exported in the
+folded-stack format read by flamegraph.pl and speedscope.
+
+Profiles are per event-loop thread, not per request: async handlers share
+that thread, so stacks from other requests running at the same time are
+included (each profile records the peak number of concurrent requests to
+judge how mixed it is), while work pushed to other threads (threadpool
+sync code, the quiz shard pool) is not captured. Sampling stops once the
+response body is sent, so BackgroundTasks that Starlette runs afterwards
+(emails, video processing, rescoring) are never part of a profile, even
+when they are async and run on the loop thread.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Optional
+
+CONFIG: dict = {
+    "sample_rate": 0.0,  # fraction of all requests to profile
+    "routes": [],  # paths always profiled, e.g. ["/submit_video"]
+    "interval_ms": 5.0,
+    "max_profiles": 20,
+}
+PROFILES: deque = deque(maxlen=CONFIG["max_profiles"])
+_LOCK = threading.Lock()
+_NEXT_ID = 0
+_IN_FLIGHT = 0  # all HTTP requests currently being served (profiled or not)
+
+
+def enabled_at_startup() -> bool:
+    return os.getenv("PROFILING_ENABLED", "").lower() in {"1", "true", "yes"}
+
+
+def configure(
+    sample_rate: Optional[float] = None,
+    routes: Optional[list[str]] = None,
+    interval_ms: Optional[float] = None,
+    max_profiles: Optional[int] = None,
+) -> dict:
+    global PROFILES
+    with _LOCK:
+        if sample_rate is not None:
+            CONFIG["sample_rate"] = min(1.0, max(0.0, float(sample_rate)))
+        if routes is not None:
+            CONFIG["routes"] = [r.rstrip("/") or "/" for r in routes]
+        if interval_ms is not None:
+            CONFIG["interval_ms"] = max(1.0, float(interval_ms))
+        if max_profiles is not None and max_profiles != PROFILES.maxlen:
+            CONFIG["max_profiles"] = max(1, int(max_profiles))
+            PROFILES = deque(PROFILES, maxlen=CONFIG["max_profiles"])
+    return dict(CONFIG)
+
+
+def _should_profile(path: str) -> bool:
+    for route in CONFIG["routes"]:
+        if path == route or path.startswith(route.rstrip("/") + "/"):
+            return True
+    rate = CONFIG["sample_rate"]
+    return rate > 0 and random.random() < rate
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, thread_id: int, interval_s: float):
+        super().__init__(name="profiling-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.stacks: Counter = Counter()
+        self.max_concurrent = _IN_FLIGHT
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+            self.max_concurrent = max(self.max_concurrent, _IN_FLIGHT)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _record(method: str, path: str, started: float, duration_s: float, stacks: Counter, max_concurrent: int) -> None:
+    global _NEXT_ID
+    with _LOCK:
+        _NEXT_ID += 1
+        PROFILES.append(
+            {
+                "id": _NEXT_ID,
+                "method": method,
+                "path": path,
+                "started_at": datetime.utcfromtimestamp(started).isoformat(),
+                "duration_ms": round(duration_s * 1000, 2),
+                "samples": sum(stacks.values()),
+                "max_concurrent_requests": max_concurrent,
+                "stacks": stacks,
+            }
+        )
+
+
+def list_profiles() -> list[dict]:
+    return [{k: v for k, v in p.items() if k != "stacks"} for p in list(PROFILES)]
+
+
+def folded(profile_id: int) -> Optional[str]:
+    """Profile as folded stacks ("f1;f2;f3 count" per line), or None."""
+    for p in list(PROFILES):
+        if p["id"] == profile_id:
+            return "".join(f"{stack} {count}\n" for stack, count in p["stacks"].most_common())
+    return None
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; requests that are not sampled pass straight through."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _IN_FLIGHT
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        # Only touched on the event-loop thread, so no lock is needed
+        _IN_FLIGHT += 1
+        state = {"counted": True, "sampler": None, "t0": 0.0, "started": 0.0}
+
+        def finish() -> None:
+            # Runs once the response is sent (or the app returns without one);
+            # BackgroundTasks that run after that are not part of the request
+            global _IN_FLIGHT
+            if state["counted"]:
+                state["counted"] = False
+                _IN_FLIGHT -= 1
+            sampler = state["sampler"]
+            if sampler is not None:
+                state["sampler"] = None
+                sampler.stop()
+                _record(
+                    scope.get("method", ""),
+                    scope["path"],
+                    state["started"],
+                    time.perf_counter() - state["t0"],
+                    sampler.stacks,
+                    sampler.max_concurrent,
+                )
+
+        async def send_wrapper(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            if not _should_profile(scope["path"]):
+                return await self.app(scope, receive, send_wrapper)
+            state["sampler"] = _Sampler(threading.get_ident(), CONFIG["interval_ms"] / 1000.0)
+            state["started"] = time.time()
+            state["t0"] = time.perf_counter()
+            state["sampler"].start()
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
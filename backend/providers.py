@@ -0,0 +1,73 @@
+"""Lazy loaders for the optional provider SDKs.
+
+Importing google.generativeai, openai, boto3 and youtube_transcript_api is
+slow and memory hungry, so each SDK is imported on first use and only when
+the matching configuration is present. A worker that never touches a
+provider never pays for its import.
+
+The first request that needs a provider pays the import inside its
+handler; set PROVIDER_WARMUP=1 to import configured providers off the
+event loop at startup instead.
+"""
+import importlib
+import os
+import threading
+from typing import Any, Callable, Optional
+
+_LOADED: dict[str, Any] = {}
+_LOCK = threading.Lock()
+
+
+def _load(name: str, importer: Callable[[], Any]) -> Optional[Any]:
+    """Import a provider once and cache it (None if unavailable)."""
+    if name in _LOADED:
+        return _LOADED[name]
+    with _LOCK:
+        if name not in _LOADED:
+            try:
+                _LOADED[name] = importer()
+            except Exception:  # pragma: no cover
+                _LOADED[name] = None
+    return _LOADED[name]
+
+
+def genai() -> Optional[Any]:
+    """google.generativeai module, or None if not configured/installed."""
+    if not os.getenv("GEMINI_API_KEY"):
+        return None
+    return _load("genai", lambda: importlib.import_module("google.generativeai"))
+
+
+def openai_client_cls() -> Optional[Any]:
+    """openai.OpenAI class, or None if not configured/installed."""
+    if not os.getenv("OPENAI_API_KEY"):
+        return None
+    return _load("openai", lambda: importlib.import_module("openai").OpenAI)
+
+
+def openai_client() -> Optional[Any]:
+    """A fresh OpenAI client, or None if not configured/installed."""
+    cls = openai_client_cls()
+    return cls() if cls is not None else None
+
+
+def boto3() -> Optional[Any]:
+    """boto3 module, or None if no bucket is configured or it is not installed."""
+    if not os.getenv("AWS_S3_BUCKET"):
+        return None
+    return _load("boto3", lambda: importlib.import_module("boto3"))
+
+
+def youtube_transcript_api() -> Optional[Any]:
+    """YouTubeTranscriptApi class, or None if not installed."""
+    return _load(
+        "youtube_transcript_api",
+        lambda: importlib.import_module("youtube_transcript_api").YouTubeTranscriptApi,
+    )
+
+
+def warm_up() -> None:
+    """Import every configured provider now rather than on the first request."""
+    genai()
+    openai_client_cls()
+    boto3()
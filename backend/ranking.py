@@ -0,0 +1,182 @@
+"""Live cohort ranking with an incremental order-statistic index.
+
+One index per (topic, metric), where metric is "quiz" (percentage score)
+or "video" (0-100 video score). Each index is a treap keyed by
+(score, quiz_id) with subtree sizes, so insert/remove, rank, percentile
+and the start of a top-K walk are O(log n) expected. Submit handlers call
+record() as scores change; dashboards read rank()/leaderboard() without
+scanning SUBMISSIONS or VIDEO_ANALYSIS.
+"""
+import random
+import threading
+from typing import Optional
+
+METRICS = ("quiz", "video")
+
+
+class _Node:
+    __slots__ = ("key", "prio", "left", "right", "size")
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.prio = random.random()
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+        self.size = 1
+
+
+def _size(n: Optional[_Node]) -> int:
+    return n.size if n is not None else 0
+
+
+def _update(n: _Node) -> _Node:
+    n.size = 1 + _size(n.left) + _size(n.right)
+    return n
+
+
+def _split(n: Optional[_Node], key: tuple) -> tuple[Optional[_Node], Optional[_Node]]:
+    """Split into (< key, >= key)."""
+    if n is None:
+        return None, None
+    if n.key < key:
+        left, right = _split(n.right, key)
+        n.right = left
+        return _update(n), right
+    left, right = _split(n.left, key)
+    n.left = right
+    return left, _update(n)
+
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    """Merge two treaps where every key in a < every key in b."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        return _update(a)
+    b.left = _merge(a, b.left)
+    return _update(b)
+
+
+class OrderStatisticTree:
+    """Multiset of (score, id) keys with O(log n) rank queries."""
+
+    def __init__(self):
+        self.root: Optional[_Node] = None
+
+    def __len__(self) -> int:
+        return _size(self.root)
+
+    def insert(self, key: tuple) -> None:
+        left, right = _split(self.root, key)
+        self.root = _merge(_merge(left, _Node(key)), right)
+
+    def remove(self, key: tuple) -> None:
+        left, rest = _split(self.root, key)
+        mid, right = _split(rest, (key[0], key[1] + "\0"))
+        # mid holds exactly the keys equal to `key`; drop one
+        if mid is not None:
+            mid = _merge(mid.left, mid.right)
+        self.root = _merge(_merge(left, mid), right)
+
+    def count_below(self, score: float) -> int:
+        """Number of keys with a score strictly below `score`."""
+        n, count = self.root, 0
+        while n is not None:
+            if n.key[0] < score:
+                count += _size(n.left) + 1
+                n = n.right
+            else:
+                n = n.left
+        return count
+
+    def count_above(self, score: float) -> int:
+        """Number of keys with a score strictly above `score`."""
+        n, count = self.root, 0
+        while n is not None:
+            if n.key[0] > score:
+                count += _size(n.right) + 1
+                n = n.left
+            else:
+                n = n.right
+        return count
+
+    def top(self, k: int) -> list[tuple]:
+        """Up to k keys in descending order."""
+        out: list[tuple] = []
+        stack: list[_Node] = []
+        n = self.root
+        while (stack or n is not None) and len(out) < k:
+            while n is not None:
+                stack.append(n)
+                n = n.right
+            n = stack.pop()
+            out.append(n.key)
+            n = n.left
+        return out
+
+
+_LOCK = threading.Lock()
+_TREES: dict[tuple[str, str], OrderStatisticTree] = {}
+# (topic, metric) -> {quiz_id: score}, to find the old key on updates
+_SCORES: dict[tuple[str, str], dict[str, float]] = {}
+
+
+def normalize_topic(topic: Optional[str]) -> str:
+    return " ".join((topic or "").lower().split()) or "general"
+
+
+def record(topic: Optional[str], metric: str, quiz_id: str, score: float) -> None:
+    """Insert or update a candidate's score for a topic."""
+    key = (normalize_topic(topic), metric)
+    with _LOCK:
+        tree = _TREES.setdefault(key, OrderStatisticTree())
+        scores = _SCORES.setdefault(key, {})
+        old = scores.get(quiz_id)
+        if old == score:
+            return
+        if old is not None:
+            tree.remove((old, quiz_id))
+        tree.insert((score, quiz_id))
+        scores[quiz_id] = score
+
+
+def rank(topic: Optional[str], metric: str, quiz_id: str) -> Optional[dict]:
+    """Rank (1 = best, ties share a rank) and mid-rank percentile, or None if unranked."""
+    key = (normalize_topic(topic), metric)
+    with _LOCK:
+        score = _SCORES.get(key, {}).get(quiz_id)
+        if score is None:
+            return None
+        tree = _TREES[key]
+        total = len(tree)
+        below = tree.count_below(score)
+        above = tree.count_above(score)
+    equal = total - below - above
+    return {
+        "topic": key[0],
+        "metric": metric,
+        "score": score,
+        "rank": above + 1,
+        "total": total,
+        "percentile": round(100.0 * (below + 0.5 * equal) / total, 2),
+    }
+
+
+def leaderboard(topic: Optional[str], metric: str, k: int = 10) -> dict:
+    key = (normalize_topic(topic), metric)
+    with _LOCK:
+        tree = _TREES.get(key)
+        if tree is None:
+            return {"topic": key[0], "metric": metric, "total": 0, "entries": []}
+        entries = tree.top(k)
+        total = len(tree)
+        ranks = {score: tree.count_above(score) + 1 for score in {s for s, _ in entries}}
+    return {
+        "topic": key[0],
+        "metric": metric,
+        "total": total,
+        "entries": [{"quiz_id": qid, "score": s, "rank": ranks[s]} for s, qid in entries],
+    }
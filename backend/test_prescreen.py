@@ -0,0 +1,53 @@
+"""Pins real on-topic answers as not rejected by the local pre-screen.
+
+Run with: python -m pytest -q (from backend/)
+"""
+import pytest
+
+import prescreen
+
+PLURALS_ANSWER = (
+    "These systems are transformers trained on huge corpora. We write prompts, the tokens become embeddings, "
+    "and the models predict the following tokens. Instruction tuned transformers follow prompts and longer "
+    "contexts better."
+)
+
+RAG_ANSWER = (
+    "For our assistant we built retrieval over company documents. Documents are chunked, each chunk is "
+    "embedded and stored in a vector store, and at query time we run a similarity search and pass the top "
+    "passages in, asking for answers grounded only in them, which cut hallucinations a lot."
+)
+
+PYTHON_ANSWER = (
+    "I mostly write Python scripts for data cleaning. I split the code into modules and functions, use classes "
+    "for the parsers, and rely on pandas dataframes and numpy arrays, packaged as a small internal library."
+)
+
+CASES = [
+    (PLURALS_ANSWER, "Generative AI"),
+    (PLURALS_ANSWER, "LLM"),
+    (RAG_ANSWER, "Generative AI"),
+    (RAG_ANSWER, "LLM"),
+    (RAG_ANSWER, "Machine Learning"),
+    (RAG_ANSWER, "Prompt Engineering for Generative AI Applications"),
+    (PYTHON_ANSWER, "Python"),
+]
+
+
+@pytest.mark.parametrize("answer,topic", CASES)
+def test_on_topic_answers_are_not_rejected(answer, topic):
+    f = prescreen.features(answer, topic)
+    decision, _, _ = prescreen.decide(f)
+    assert decision != "reject", (topic, f)
+
+
+def test_plurals_and_gerunds_match_keywords():
+    assert prescreen._terms("models prompts tokens embeddings transformers training") >= {
+        prescreen._stem(k) for k in ("model", "prompt", "token", "embedding", "transformer", "training")
+    }
+
+
+def test_off_topic_answer_is_still_rejected():
+    answer = " ".join(["I cooked a tasty dinner recipe with fresh vegetables and garlic."] * 3)
+    decision, score, _ = prescreen.decide(prescreen.features(answer, "Python"))
+    assert (decision, score) == ("reject", 20)
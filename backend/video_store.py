@@ -0,0 +1,235 @@
+"""Content-addressed storage for uploaded videos.
+
+Uploads are streamed to disk while their SHA-256 is computed, then stored
+under a key derived from that hash (``videos/ab/abcdef...mp4``) in the local
+uploads dir or in S3. CONTENT_INDEX maps each hash to its stored path and
+any transcript/analysis already produced for those bytes, so an identical
+resubmission skips the S3 put, Whisper and the GPT call.
+"""
+import hashlib
+import math
+import os
+import tempfile
+import uuid
+from typing import Any, Optional
+
+from fastapi import UploadFile
+
+import providers
+
+CHUNK_SIZE = 1024 * 1024
+
+# S3 multipart limits: parts >= 5 MiB (except the last), at most 10,000 parts
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10_000
+
+# sha256 -> {"path", "transcript", "feedback", "video_score"}
+CONTENT_INDEX: dict[str, dict] = {}
+
+
+def uploads_dir() -> str:
+    return os.path.join(os.getcwd(), "uploads")
+
+
+def s3_bucket() -> Optional[str]:
+    return os.getenv("AWS_S3_BUCKET") or None
+
+
+def s3_client() -> Optional[Any]:
+    """S3 client for the configured bucket, or None if S3 is not configured.
+
+    AWS_S3_ENDPOINT_URL points at an S3-compatible stand-in (MinIO, moto).
+    """
+    boto3 = providers.boto3()
+    if not s3_bucket() or boto3 is None:
+        return None
+    return boto3.client(
+        "s3",
+        region_name=os.getenv("AWS_REGION"),
+        endpoint_url=os.getenv("AWS_S3_ENDPOINT_URL") or None,
+    )
+
+
+def content_key(digest: str, filename: Optional[str]) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return f"videos/{digest[:2]}/{digest}{ext}"
+
+
+def _mkstemp(filename: Optional[str]) -> tuple[int, str]:
+    tmp_dir = os.path.join(uploads_dir(), ".tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    return tempfile.mkstemp(dir=tmp_dir, suffix=os.path.splitext(filename or "")[1].lower())
+
+
+async def spool_upload(file: UploadFile) -> tuple[str, str]:
+    """Stream an upload to a temp file, hashing as we go. Returns (digest, tmp_path)."""
+    h = hashlib.sha256()
+    fd, tmp_path = _mkstemp(file.filename)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                h.update(chunk)
+                out.write(chunk)
+    except Exception:
+        discard(tmp_path)
+        raise
+    return h.hexdigest(), tmp_path
+
+
+def store(digest: str, tmp_path: str, filename: Optional[str], content_type: Optional[str]) -> dict:
+    """Persist spooled bytes under their content key.
+
+    Returns {"path": stored location, "local_path": readable copy on disk}.
+    Existing objects (local or S3) are never rewritten.
+    """
+    key = content_key(digest, filename)
+    bucket = s3_bucket()
+    s3 = s3_client()
+    if s3 is not None:
+        try:
+            try:
+                s3.head_object(Bucket=bucket, Key=key)
+            except Exception:
+                s3.upload_file(
+                    tmp_path,
+                    bucket,
+                    key,
+                    ExtraArgs={"ContentType": content_type or "application/octet-stream"},
+                )
+            return {"path": f"s3://{bucket}/{key}", "local_path": tmp_path}
+        except Exception:
+            # Fallback to local save
+            pass
+
+    local_path = os.path.join(uploads_dir(), *key.split("/"))
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    if os.path.exists(local_path):
+        discard(tmp_path)
+    else:
+        os.replace(tmp_path, local_path)
+    return {"path": local_path, "local_path": local_path}
+
+
+def _part_size(size: int) -> int:
+    default = int(os.getenv("VIDEO_UPLOAD_PART_SIZE", str(8 * 1024 * 1024)))
+    return max(MIN_PART_SIZE, default, math.ceil(size / MAX_PARTS))
+
+
+def staging_prefix(quiz_id: str) -> str:
+    return f"incoming/{quiz_id}/"
+
+
+def initiate_multipart(quiz_id: str, filename: Optional[str], content_type: Optional[str], size: int) -> dict:
+    """Start a multipart upload on a staging key and presign a URL per part."""
+    s3 = s3_client()
+    if s3 is None:
+        raise RuntimeError("S3 not configured")
+    bucket = s3_bucket()
+    ext = os.path.splitext(filename or "")[1].lower()
+    key = f"{staging_prefix(quiz_id)}{uuid.uuid4().hex}{ext}"
+    mp = s3.create_multipart_upload(
+        Bucket=bucket, Key=key, ContentType=content_type or "application/octet-stream"
+    )
+    upload_id = mp["UploadId"]
+    part_size = _part_size(size)
+    expires = int(os.getenv("VIDEO_UPLOAD_URL_TTL_SECONDS", "3600"))
+    parts = [
+        {
+            "part_number": n,
+            "url": s3.generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": bucket, "Key": key, "UploadId": upload_id, "PartNumber": n},
+                ExpiresIn=expires,
+            ),
+        }
+        for n in range(1, math.ceil(size / part_size) + 1)
+    ]
+    return {"key": key, "upload_id": upload_id, "part_size": part_size, "parts": parts}
+
+
+def complete_multipart(key: str, upload_id: str, parts: list[dict]) -> None:
+    s3 = s3_client()
+    if s3 is None:
+        raise RuntimeError("S3 not configured")
+    s3.complete_multipart_upload(
+        Bucket=s3_bucket(),
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [
+                {"PartNumber": int(p["part_number"]), "ETag": p["etag"]}
+                for p in sorted(parts, key=lambda p: int(p["part_number"]))
+            ]
+        },
+    )
+
+
+def abort_multipart(key: str, upload_id: str) -> None:
+    s3 = s3_client()
+    if s3 is None:
+        raise RuntimeError("S3 not configured")
+    s3.abort_multipart_upload(Bucket=s3_bucket(), Key=key, UploadId=upload_id)
+
+
+def spool_object(key: str) -> tuple[str, str]:
+    """Stream an S3 object to a temp file, hashing as we go. Returns (digest, tmp_path)."""
+    s3 = s3_client()
+    if s3 is None:
+        raise RuntimeError("S3 not configured")
+    h = hashlib.sha256()
+    fd, tmp_path = _mkstemp(key)
+    try:
+        body = s3.get_object(Bucket=s3_bucket(), Key=key)["Body"]
+        with os.fdopen(fd, "wb") as out:
+            for chunk in body.iter_chunks(CHUNK_SIZE):
+                h.update(chunk)
+                out.write(chunk)
+    except Exception:
+        discard(tmp_path)
+        raise
+    return h.hexdigest(), tmp_path
+
+
+def promote(staging_key: str, digest: str, tmp_path: str) -> dict:
+    """Server-side copy a staged object to its content key (if not already there).
+
+    Same return shape as store(); the staged object itself is left for the
+    caller to delete.
+    """
+    s3 = s3_client()
+    if s3 is None:
+        raise RuntimeError("S3 not configured")
+    bucket = s3_bucket()
+    key = content_key(digest, staging_key)
+    try:
+        s3.head_object(Bucket=bucket, Key=key)
+    except Exception:
+        s3.copy(
+            {"Bucket": bucket, "Key": staging_key},
+            bucket,
+            key,
+            ExtraArgs={"MetadataDirective": "COPY"},
+        )
+    return {"path": f"s3://{bucket}/{key}", "local_path": tmp_path}
+
+
+def delete_object(key: str) -> None:
+    s3 = s3_client()
+    if s3 is None:
+        return
+    try:
+        s3.delete_object(Bucket=s3_bucket(), Key=key)
+    except Exception:
+        pass
+
+
+def discard(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -11,21 +11,31 @@ export default function FinalPage() {
   const [feedback, setFeedback] = useState<string | null>(null);
 
   useEffect(() => {
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    let cancelled = false;
     const run = async () => {
       try {
         const res = await fetch(`${API_BASE}/final_result/${quizId}`);
         if (!res.ok) throw new Error("Failed to load final result");
         const json = await res.json();
+        // Direct uploads are processed in the background; poll until done
+        if (json.video_status === "processing") {
+          if (!cancelled) timer = setTimeout(run, 3000);
+          return;
+        }
         setSelected(json.selected);
         setPassedQuiz(json.passed_quiz);
         setFeedback(json.feedback);
       } catch (e) {
         // ignore
-      } finally {
-        setLoading(false);
       }
+      setLoading(false);
     };
     if (quizId) run();
+    return () => {
+      cancelled = true;
+      if (timer) clearTimeout(timer);
+    };
   }, [quizId]);
 
   if (loading) return <div className="max-w-3xl mx-auto px-6 py-16">Evaluating...</div>;
@@ -11,18 +11,68 @@ export default function VideoPage() {
   const [loading, setLoading] = useState(false);
   const inputRef = useRef<HTMLInputElement>(null);
 
-  const submit = async () => {
-    if (!file) return;
+  // Upload parts straight to storage via presigned URLs; false if the backend
+  // has no S3 configured (caller falls back to /submit_video).
+  const uploadDirect = async (f: File): Promise<boolean> => {
+    const init = await fetch(`${API_BASE}/video_upload/initiate`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ quiz_id: String(quizId), filename: f.name, content_type: f.type || null, size: f.size }),
+    });
+    if (init.status === 503) return false;
+    if (!init.ok) throw new Error("Upload failed");
+    const { key, upload_id, part_size, parts } = (await init.json()) as {
+      key: string;
+      upload_id: string;
+      part_size: number;
+      parts: { part_number: number; url: string }[];
+    };
+
     try {
-      setLoading(true);
-      const fd = new FormData();
-      fd.append("quiz_id", String(quizId));
-      fd.append("file", file);
-      const res = await fetch(`${API_BASE}/submit_video`, {
+      const done: { part_number: number; etag: string }[] = [];
+      const queue = [...parts];
+      const worker = async () => {
+        for (let p = queue.shift(); p; p = queue.shift()) {
+          const start = (p.part_number - 1) * part_size;
+          const res = await fetch(p.url, { method: "PUT", body: f.slice(start, start + part_size) });
+          const etag = res.headers.get("ETag");
+          if (!res.ok || !etag) throw new Error("Upload failed");
+          done.push({ part_number: p.part_number, etag });
+        }
+      };
+      await Promise.all(Array.from({ length: Math.min(4, parts.length) }, worker));
+
+      const res = await fetch(`${API_BASE}/video_upload/complete`, {
         method: "POST",
-        body: fd,
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ quiz_id: String(quizId), key, upload_id, filename: f.name, parts: done }),
       });
       if (!res.ok) throw new Error("Upload failed");
+      return true;
+    } catch (e) {
+      fetch(`${API_BASE}/video_upload/abort`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ quiz_id: String(quizId), key, upload_id }),
+      }).catch(() => {});
+      throw e;
+    }
+  };
+
+  const submit = async () => {
+    if (!file) return;
+    try {
+      setLoading(true);
+      if (!(await uploadDirect(file))) {
+        const fd = new FormData();
+        fd.append("quiz_id", String(quizId));
+        fd.append("file", file);
+        const res = await fetch(`${API_BASE}/submit_video`, {
+          method: "POST",
+          body: fd,
+        });
+        if (!res.ok) throw new Error("Upload failed");
+      }
       router.push(`/final/${quizId}`);
     } catch (e) {
       alert((e as Error).message);